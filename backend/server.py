@@ -1,26 +1,46 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, UploadFile
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, status, File, UploadFile
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.middleware.gzip import GZipMiddleware
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from bson import ObjectId
+from bson.errors import InvalidId
+from gridfs.errors import NoFile
 import os
+import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, Field, EmailStr
+from typing import Annotated, List, Optional
 import uuid
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 import bcrypt
 import jwt
 import base64
+from cachetools import TTLCache
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.environ.get("MONGO_POOL", "200")),
+    minPoolSize=20,
+    compressors="zstd,zlib",  # negotiated with the server in order
+    zlibCompressionLevel=-1,
+    serverSelectionTimeoutMS=3000,
+    waitQueueTimeoutMS=2000
+)
 db = client[os.environ['DB_NAME']]
+images_bucket = AsyncIOMotorGridFSBucket(db, bucket_name="images")
+# Multi-document transactions need a replica set or mongos; detected on startup
+transactions_supported = False
 
 # Create the main app without a prefix
 app = FastAPI(title="ReWear - Community Clothing Exchange API")
@@ -28,32 +48,89 @@ app = FastAPI(title="ReWear - Community Clothing Exchange API")
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Projections for list endpoints; full documents are only returned by get_item
+ITEM_SUMMARY_PROJECTION = {"_id": 0, "images": 0, "description": 0}
+ITEM_FEATURED_PROJECTION = {"_id": 0, "images": {"$slice": 1}, "description": 0}
+SWAP_PROJECTION = {"_id": 0}
+# Newest first; id breaks created_at ties so skip/limit pages never overlap
+NEWEST_FIRST = [("created_at", -1), ("id", 1)]
+
+# Image uploads
+IMAGE_URL_PREFIX = "/api/uploads/"
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024  # 5 MB
+
 # Security
 security = HTTPBearer()
-SECRET_KEY = "rewear_secret_key_2025"
+SECRET_KEY = os.environ['JWT_SECRET']
 ALGORITHM = "HS256"
+# Reused JWT codec and decode settings so per-request auth skips setup work
+_JWT = jwt.PyJWT()
+JWT_DECODE_OPTIONS = {"verify_signature": True, "require": ["exp", "sub"]}
 ACCESS_TOKEN_EXPIRE_HOURS = 24 * 7  # 7 days
+BCRYPT_COST = int(os.environ.get("BCRYPT_COST", "10"))
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# bcrypt is CPU-bound; run it in worker processes so it never blocks the event loop
+_BCRYPT_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+# Short-lived cache of authenticated users keyed by raw token: token -> (exp, UserResponse)
+AUTH_CACHE_TTL_SECONDS = 30
+_AUTH_CACHE = TTLCache(maxsize=10000, ttl=AUTH_CACHE_TTL_SECONDS)
+
+# Featured carousel memo: (monotonic timestamp, items)
+FEATURED_CACHE_TTL_SECONDS = 10
+_FEATURED_CACHE: tuple = (0.0, [])
+# Bumped by every invalidation so a query that started before it cannot store stale items
+_FEATURED_GENERATION = 0
 
 # Models
+# Shared config for all API models: drop unknown keys (e.g. Mongo's _id) and skip default validation
+MODEL_CONFIG = ConfigDict(extra="ignore", str_strip_whitespace=False, validate_default=False, frozen=False)
+
+def to_epoch_seconds(value):
+    # Documents written before created_at became an int hold naive UTC datetimes
+    if isinstance(value, datetime):
+        return int(value.replace(tzinfo=value.tzinfo or timezone.utc).timestamp())
+    return value
+
+EpochSeconds = Annotated[int, BeforeValidator(to_epoch_seconds)]
+
+def to_image_id(value: str) -> str:
+    # Items reference uploaded images by GridFS id (or its /api/uploads/ URL), never inline data
+    image_id = value.removeprefix(IMAGE_URL_PREFIX)
+    if not ObjectId.is_valid(image_id):
+        raise ValueError("images must be ids returned by /api/uploads")
+    return image_id
+
+ImageId = Annotated[str, AfterValidator(to_image_id)]
+
 class User(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     email: EmailStr
     name: str
     password_hash: str
     points: int = Field(default=100)  # Starting points for new users
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: EpochSeconds = Field(default_factory=lambda: int(time.time()))  # epoch seconds
     is_admin: bool = Field(default=False)
 
 class UserCreate(BaseModel):
+    model_config = MODEL_CONFIG
+
     email: EmailStr
     name: str
-    password: str
+    password: str = Field(min_length=8, max_length=BCRYPT_MAX_PASSWORD_BYTES)
 
 class UserLogin(BaseModel):
+    model_config = MODEL_CONFIG
+
     email: EmailStr
     password: str
 
 class UserResponse(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: str
     email: str
     name: str
@@ -61,6 +138,8 @@ class UserResponse(BaseModel):
     is_admin: bool
 
 class Item(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
     description: str
@@ -69,15 +148,36 @@ class Item(BaseModel):
     size: str
     condition: str  # new, like-new, good, fair
     tags: List[str] = Field(default_factory=list)
-    images: List[str] = Field(default_factory=list)  # base64 encoded images
+    images: List[str] = Field(default_factory=list)  # GridFS image ids from /api/uploads
     owner_id: str
     owner_name: str
     points_value: int = Field(default=10)
     status: str = Field(default="available")  # available, pending, swapped
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: EpochSeconds = Field(default_factory=lambda: int(time.time()))  # epoch seconds
     approved: bool = Field(default=True)  # For admin moderation
 
+class ItemSummary(BaseModel):
+    model_config = MODEL_CONFIG
+
+    # Lightweight list view of Item without the description and inline images
+    id: str
+    title: str
+    category: str
+    type: str
+    size: str
+    condition: str
+    tags: List[str] = Field(default_factory=list)
+    images: List[str] = Field(default_factory=list)  # at most one thumbnail, featured only
+    owner_id: str
+    owner_name: str
+    points_value: int = Field(default=10)
+    status: str = Field(default="available")
+    created_at: EpochSeconds = Field(default_factory=lambda: int(time.time()))  # epoch seconds
+    approved: bool = Field(default=True)
+
 class ItemCreate(BaseModel):
+    model_config = MODEL_CONFIG
+
     title: str
     description: str
     category: str
@@ -85,10 +185,12 @@ class ItemCreate(BaseModel):
     size: str
     condition: str
     tags: List[str] = Field(default_factory=list)
-    images: List[str] = Field(default_factory=list)
+    images: List[ImageId] = Field(default_factory=list)  # GridFS image ids from /api/uploads
     points_value: int = Field(default=10)
 
 class SwapRequest(BaseModel):
+    model_config = MODEL_CONFIG
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     item_id: str
     requester_id: str
@@ -97,21 +199,36 @@ class SwapRequest(BaseModel):
     swap_type: str  # "direct" or "points"
     offered_item_id: Optional[str] = None  # For direct swaps
     message: str = ""
+    points_value: int = 0  # item's points value captured when the request is created
     status: str = Field(default="pending")  # pending, accepted, rejected, completed
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: EpochSeconds = Field(default_factory=lambda: int(time.time()))  # epoch seconds
 
 class SwapRequestCreate(BaseModel):
+    model_config = MODEL_CONFIG
+
     item_id: str
     swap_type: str
     offered_item_id: Optional[str] = None
     message: str = ""
 
 # Helper functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    # bcrypt silently ignores everything past 72 bytes; refuse instead of truncating
+    encoded = password.encode('utf-8')
+    if len(encoded) > BCRYPT_MAX_PASSWORD_BYTES:
+        raise HTTPException(status_code=400, detail="Password must be at most 72 bytes")
+    
+    loop = asyncio.get_running_loop()
+    hashed = await loop.run_in_executor(
+        _BCRYPT_POOL, bcrypt.hashpw, encoded, bcrypt.gensalt(rounds=BCRYPT_COST)
+    )
+    return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _BCRYPT_POOL, bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8')
+    )
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -120,12 +237,27 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _JWT.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def invalidate_featured_cache():
+    global _FEATURED_CACHE, _FEATURED_GENERATION
+    _FEATURED_CACHE = (0.0, [])
+    _FEATURED_GENERATION += 1
+
+def invalidate_user_cache(*user_ids: str):
+    stale = [token for token, (_, user) in _AUTH_CACHE.items() if user.id in user_ids]
+    for token in stale:
+        _AUTH_CACHE.pop(token, None)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    cached = _AUTH_CACHE.get(token)
+    if cached is not None and cached[0] > time.time():
+        return cached[1]
+    
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _JWT.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options=JWT_DECODE_OPTIONS)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
@@ -135,7 +267,11 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     user = await db.users.find_one({"id": user_id})
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return UserResponse(**user)
+    current_user = UserResponse(**user)
+    
+    # Entries expire after AUTH_CACHE_TTL_SECONDS or the token's own exp, whichever is first
+    _AUTH_CACHE[token] = (payload["exp"], current_user)
+    return current_user
 
 # Authentication endpoints
 @api_router.post("/auth/register", response_model=dict)
@@ -146,14 +282,16 @@ async def register(user_data: UserCreate):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password and create user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     user = User(
         email=user_data.email,
         name=user_data.name,
         password_hash=hashed_password
     )
     
-    await db.users.insert_one(user.dict())
+    # Flat models: hand Motor a shallow copy of the field values instead of re-dumping
+    # (Motor adds _id to the dict it is given, so the model itself stays clean)
+    await db.users.insert_one(user.__dict__.copy())
     
     # Create access token
     access_token = create_access_token(data={"sub": user.id})
@@ -161,15 +299,25 @@ async def register(user_data: UserCreate):
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": UserResponse(**user.dict())
+        "user": UserResponse.model_construct(**user.__dict__)
     }
 
 @api_router.post("/auth/login", response_model=dict)
 async def login(user_data: UserLogin):
     user = await db.users.find_one({"email": user_data.email})
-    if not user or not verify_password(user_data.password, user["password_hash"]):
+    if not user or not await verify_password(user_data.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Incorrect email or password")
     
+    # Rehash passwords stored with a different bcrypt cost ("$2b$<cost>$..."); legacy
+    # passwords over 72 bytes keep their existing hash since hash_password refuses them
+    if (int(user["password_hash"][4:6]) != BCRYPT_COST
+            and len(user_data.password.encode('utf-8')) <= BCRYPT_MAX_PASSWORD_BYTES):
+        new_hash = await hash_password(user_data.password)
+        await db.users.update_one(
+            {"id": user["id"]},
+            {"$set": {"password_hash": new_hash}}
+        )
+    
     access_token = create_access_token(data={"sub": user["id"]})
     
     return {
@@ -183,31 +331,46 @@ async def get_me(current_user: UserResponse = Depends(get_current_user)):
     return current_user
 
 # Item endpoints
+# List endpoints read trusted documents written by this API, so they build models with
+# model_construct; FastAPI passes the instances through response validation unchanged
+# and serializes them straight to JSON bytes in pydantic's core.
 @api_router.post("/items", response_model=Item)
 async def create_item(item_data: ItemCreate, current_user: UserResponse = Depends(get_current_user)):
     item = Item(
-        **item_data.dict(),
+        **item_data.model_dump(mode="python"),
         owner_id=current_user.id,
         owner_name=current_user.name
     )
     
-    await db.items.insert_one(item.dict())
+    await db.items.insert_one(item.__dict__.copy())
+    invalidate_featured_cache()
     return item
 
-@api_router.get("/items", response_model=List[Item])
-async def get_items(category: Optional[str] = None, limit: int = 20, skip: int = 0):
+@api_router.get("/items", response_model=List[ItemSummary])
+async def get_items(category: Optional[str] = None, limit: int = Query(20, ge=1, le=100), skip: int = Query(0, ge=0)):
     query = {"status": "available", "approved": True}
     if category:
         query["category"] = category
     
-    items = await db.items.find(query).skip(skip).limit(limit).to_list(limit)
-    return [Item(**item) for item in items]
+    items = await db.items.find(query, ITEM_SUMMARY_PROJECTION).sort(NEWEST_FIRST).skip(skip).limit(limit).to_list(limit)
+    return [ItemSummary.model_construct(**item) for item in items]
 
-@api_router.get("/items/featured", response_model=List[Item])
+@api_router.get("/items/featured", response_model=List[ItemSummary])
 async def get_featured_items():
+    global _FEATURED_CACHE
+    now = time.monotonic()
+    if now - _FEATURED_CACHE[0] < FEATURED_CACHE_TTL_SECONDS:
+        return _FEATURED_CACHE[1]
+    generation = _FEATURED_GENERATION
+    
     # Get 6 most recent items for featured carousel
-    items = await db.items.find({"status": "available", "approved": True}).sort("created_at", -1).limit(6).to_list(6)
-    return [Item(**item) for item in items]
+    items = await db.items.find(
+        {"status": "available", "approved": True}, ITEM_FEATURED_PROJECTION
+    ).sort(NEWEST_FIRST).limit(6).to_list(6)
+    featured = [ItemSummary.model_construct(**item) for item in items]
+    if generation == _FEATURED_GENERATION:
+        _FEATURED_CACHE = (now, featured)
+    return featured
 
 @api_router.get("/items/{item_id}", response_model=Item)
 async def get_item(item_id: str):
@@ -216,10 +379,41 @@ async def get_item(item_id: str):
         raise HTTPException(status_code=404, detail="Item not found")
     return Item(**item)
 
-@api_router.get("/items/user/{user_id}", response_model=List[Item])
-async def get_user_items(user_id: str):
-    items = await db.items.find({"owner_id": user_id}).to_list(100)
-    return [Item(**item) for item in items]
+@api_router.get("/items/user/{user_id}", response_model=List[ItemSummary])
+async def get_user_items(user_id: str, limit: int = Query(50, ge=1, le=100), skip: int = Query(0, ge=0)):
+    cursor = db.items.find({"owner_id": user_id}, ITEM_SUMMARY_PROJECTION).sort(NEWEST_FIRST).skip(skip).limit(limit)
+    return [ItemSummary.model_construct(**item) async for item in cursor]
+
+# Image upload endpoints
+@api_router.post("/uploads", response_model=dict)
+async def upload_image(file: UploadFile = File(...), current_user: UserResponse = Depends(get_current_user)):
+    if not (file.content_type or "").startswith("image/"):
+        raise HTTPException(status_code=400, detail="Only image uploads are allowed")
+    
+    data = await file.read(MAX_UPLOAD_BYTES + 1)
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image must be at most 5 MB")
+    
+    image_id = await images_bucket.upload_from_stream(
+        file.filename or "image",
+        data,
+        metadata={"content_type": file.content_type, "owner_id": current_user.id}
+    )
+    return {"image_id": str(image_id), "url": f"{IMAGE_URL_PREFIX}{image_id}"}
+
+@api_router.get("/uploads/{image_id}")
+async def get_image(image_id: str):
+    try:
+        stream = await images_bucket.open_download_stream(ObjectId(image_id))
+    except (InvalidId, NoFile):
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    data = await stream.read()
+    return Response(
+        content=data,
+        media_type=(stream.metadata or {}).get("content_type", "application/octet-stream"),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
 
 # Swap endpoints
 @api_router.post("/swaps", response_model=SwapRequest)
@@ -232,7 +426,8 @@ async def create_swap_request(swap_data: SwapRequestCreate, current_user: UserRe
     if item["owner_id"] == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot swap your own item")
     
-    # For points-based swaps, check if user has enough points
+    # For points-based swaps, reject early on the (possibly cached) balance;
+    # accept_swap enforces it atomically
     if swap_data.swap_type == "points":
         if current_user.points < item["points_value"]:
             raise HTTPException(status_code=400, detail="Insufficient points")
@@ -244,54 +439,100 @@ async def create_swap_request(swap_data: SwapRequestCreate, current_user: UserRe
         owner_id=item["owner_id"],
         swap_type=swap_data.swap_type,
         offered_item_id=swap_data.offered_item_id,
-        message=swap_data.message
+        message=swap_data.message,
+        points_value=item["points_value"]
     )
     
-    await db.swap_requests.insert_one(swap_request.dict())
+    await db.swap_requests.insert_one(swap_request.__dict__.copy())
     return swap_request
 
 @api_router.get("/swaps/incoming", response_model=List[SwapRequest])
-async def get_incoming_swaps(current_user: UserResponse = Depends(get_current_user)):
-    swaps = await db.swap_requests.find({"owner_id": current_user.id}).to_list(100)
-    return [SwapRequest(**swap) for swap in swaps]
+async def get_incoming_swaps(limit: int = Query(50, ge=1, le=100), skip: int = Query(0, ge=0), current_user: UserResponse = Depends(get_current_user)):
+    cursor = db.swap_requests.find({"owner_id": current_user.id}, SWAP_PROJECTION).sort(NEWEST_FIRST).skip(skip).limit(limit)
+    return [SwapRequest.model_construct(**swap) async for swap in cursor]
 
 @api_router.get("/swaps/outgoing", response_model=List[SwapRequest])
-async def get_outgoing_swaps(current_user: UserResponse = Depends(get_current_user)):
-    swaps = await db.swap_requests.find({"requester_id": current_user.id}).to_list(100)
-    return [SwapRequest(**swap) for swap in swaps]
+async def get_outgoing_swaps(limit: int = Query(50, ge=1, le=100), skip: int = Query(0, ge=0), current_user: UserResponse = Depends(get_current_user)):
+    cursor = db.swap_requests.find({"requester_id": current_user.id}, SWAP_PROJECTION).sort(NEWEST_FIRST).skip(skip).limit(limit)
+    return [SwapRequest.model_construct(**swap) async for swap in cursor]
 
 @api_router.put("/swaps/{swap_id}/accept")
 async def accept_swap(swap_id: str, current_user: UserResponse = Depends(get_current_user)):
     swap = await db.swap_requests.find_one({"id": swap_id, "owner_id": current_user.id})
     if not swap:
         raise HTTPException(status_code=404, detail="Swap request not found")
+    if swap["status"] != "pending":
+        raise HTTPException(status_code=409, detail="Swap request already resolved")
     
-    # Update swap status
-    await db.swap_requests.update_one(
-        {"id": swap_id},
-        {"$set": {"status": "accepted"}}
-    )
+    is_points_swap = swap["swap_type"] == "points"
+    points_value = swap.get("points_value")
+    if is_points_swap and points_value is None:
+        # Requests created before points_value was stored on the swap
+        item = await db.items.find_one({"id": swap["item_id"]}, {"points_value": 1})
+        points_value = item["points_value"]
     
-    # Handle points transfer for points-based swaps
-    if swap["swap_type"] == "points":
-        # Get item details
-        item = await db.items.find_one({"id": swap["item_id"]})
-        
-        # Deduct points from requester and add to owner
-        await db.users.update_one(
-            {"id": swap["requester_id"]},
-            {"$inc": {"points": -item["points_value"]}}
-        )
-        await db.users.update_one(
-            {"id": current_user.id},
-            {"$inc": {"points": item["points_value"]}}
+    async def claim_swap(session=None):
+        # Only one accept can move the swap out of pending, so points move at most once
+        result = await db.swap_requests.update_one(
+            {"id": swap_id, "status": "pending"},
+            {"$set": {"status": "accepted"}},
+            session=session
         )
-        
-        # Mark item as swapped
-        await db.items.update_one(
-            {"id": swap["item_id"]},
-            {"$set": {"status": "swapped"}}
+        if result.modified_count == 0:
+            raise HTTPException(status_code=409, detail="Swap request already resolved")
+    
+    async def debit_requester(session=None):
+        # Conditional $inc so concurrent accepts can never drive the balance negative
+        result = await db.users.update_one(
+            {"id": swap["requester_id"], "points": {"$gte": points_value}},
+            {"$inc": {"points": -points_value}},
+            session=session
         )
+        if result.matched_count == 0:
+            raise HTTPException(status_code=400, detail="Insufficient points")
+    
+    def credit_writes(session=None):
+        # Credit the owner and mark the item as swapped
+        return [
+            db.users.update_one(
+                {"id": current_user.id},
+                {"$inc": {"points": points_value}},
+                session=session
+            ),
+            db.items.update_one(
+                {"id": swap["item_id"]},
+                {"$set": {"status": "swapped"}},
+                session=session
+            )
+        ]
+    
+    if transactions_supported:
+        # Operations within a transaction must not overlap, so apply them in order
+        async with await client.start_session() as session:
+            async with session.start_transaction():
+                await claim_swap(session)
+                if is_points_swap:
+                    await debit_requester(session)
+                    for write in credit_writes(session):
+                        await write
+    else:
+        await claim_swap()
+        if is_points_swap:
+            try:
+                await debit_requester()
+            except HTTPException:
+                # Release the claim so the swap can be accepted once the requester has the points
+                await db.swap_requests.update_one(
+                    {"id": swap_id, "status": "accepted"},
+                    {"$set": {"status": "pending"}}
+                )
+                raise
+            await asyncio.gather(*credit_writes())
+    
+    if is_points_swap:
+        # Cached user snapshots now carry stale point balances
+        invalidate_user_cache(swap["requester_id"], current_user.id)
+        invalidate_featured_cache()
     
     return {"message": "Swap request accepted"}
 
@@ -304,13 +545,13 @@ async def reject_swap(swap_id: str, current_user: UserResponse = Depends(get_cur
     return {"message": "Swap request rejected"}
 
 # Admin endpoints
-@api_router.get("/admin/items", response_model=List[Item])
-async def get_admin_items(current_user: UserResponse = Depends(get_current_user)):
+@api_router.get("/admin/items", response_model=List[ItemSummary])
+async def get_admin_items(limit: int = Query(50, ge=1, le=100), skip: int = Query(0, ge=0), current_user: UserResponse = Depends(get_current_user)):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    items = await db.items.find().to_list(1000)
-    return [Item(**item) for item in items]
+    cursor = db.items.find({}, ITEM_SUMMARY_PROJECTION).sort(NEWEST_FIRST).skip(skip).limit(limit)
+    return [ItemSummary.model_construct(**item) async for item in cursor]
 
 @api_router.put("/admin/items/{item_id}/approve")
 async def approve_item(item_id: str, current_user: UserResponse = Depends(get_current_user)):
@@ -321,6 +562,7 @@ async def approve_item(item_id: str, current_user: UserResponse = Depends(get_cu
         {"id": item_id},
         {"$set": {"approved": True}}
     )
+    invalidate_featured_cache()
     return {"message": "Item approved"}
 
 @api_router.delete("/admin/items/{item_id}")
@@ -329,19 +571,34 @@ async def delete_item(item_id: str, current_user: UserResponse = Depends(get_cur
         raise HTTPException(status_code=403, detail="Admin access required")
     
     await db.items.delete_one({"id": item_id})
+    invalidate_featured_cache()
     return {"message": "Item deleted"}
 
 # Include the router in the main app
 app.include_router(api_router)
 
+# Tolerate spaces and stray commas in the comma-separated list
+CORS_ORIGINS = [origin.strip() for origin in os.environ.get("CORS_ORIGINS", "http://localhost:3000").split(",") if origin.strip()]
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=["*"],
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origins=CORS_ORIGINS,
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,  # let browsers cache preflight responses for a day
 )
 
+class JSONGZipMiddleware(GZipMiddleware):
+    """GZip for API responses; uploaded images are already compressed and pass through as-is"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(IMAGE_URL_PREFIX):
+            await self.app(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -349,6 +606,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def configure_default_executor():
+    # Larger thread pool for blocking fallbacks (DNS, TLS) so bursts don't queue
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=int(os.environ.get("THREAD_POOL_SIZE", "128")))
+    )
+
+@app.on_event("startup")
+async def create_indexes():
+    await db.users.create_index("email", unique=True)
+    await db.users.create_index("id", unique=True)
+    await db.items.create_index("id", unique=True)
+    # List endpoints sort by NEWEST_FIRST, so their indexes end with it
+    await db.items.create_index([("owner_id", 1), *NEWEST_FIRST])
+    await db.items.create_index(NEWEST_FIRST)
+    await db.items.create_index([("status", 1), ("approved", 1), *NEWEST_FIRST])
+    await db.items.create_index([("status", 1), ("approved", 1), ("category", 1), *NEWEST_FIRST])
+    await db.swap_requests.create_index([("owner_id", 1), *NEWEST_FIRST])
+    await db.swap_requests.create_index([("requester_id", 1), *NEWEST_FIRST])
+    await db.swap_requests.create_index([("id", 1), ("owner_id", 1)])
+
+@app.on_event("startup")
+async def migrate_created_at_to_epoch():
+    # Convert legacy BSON dates (milliseconds) to epoch seconds so sorting stays consistent
+    to_seconds = [{"$set": {"created_at": {"$toLong": {"$divide": [{"$toLong": "$created_at"}, 1000]}}}}]
+    for collection in (db.users, db.items, db.swap_requests):
+        await collection.update_many({"created_at": {"$type": "date"}}, to_seconds)
+
+@app.on_event("startup")
+async def migrate_inline_images_to_gridfs():
+    # Items created before /api/uploads stored base64 data URIs; move them into GridFS ids
+    async for item in db.items.find({"images": {"$regex": "^data:"}}, {"id": 1, "owner_id": 1, "images": 1}):
+        images = []
+        for image in item["images"]:
+            header, _, payload = image.partition(",")
+            if image.startswith("data:") and header.endswith(";base64"):
+                image_id = await images_bucket.upload_from_stream(
+                    item["id"],
+                    base64.b64decode(payload),
+                    metadata={"content_type": header[5:].partition(";")[0] or "application/octet-stream", "owner_id": item["owner_id"]}
+                )
+                image = str(image_id)
+            images.append(image)
+        # Only swap in the ids if no other worker has migrated this item meanwhile
+        await db.items.update_one({"id": item["id"], "images": item["images"]}, {"$set": {"images": images}})
+
+@app.on_event("startup")
+async def detect_transaction_support():
+    global transactions_supported
+    hello = await client.admin.command("hello")
+    transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+
+@app.on_event("shutdown")
+async def shutdown_bcrypt_pool():
+    _BCRYPT_POOL.shutdown(wait=False)
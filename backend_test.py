@@ -4,90 +4,280 @@ Comprehensive Backend API Testing for ReWear Community Clothing Exchange
 Tests all core functionality including authentication, item management, points system, and swaps.
 """
 
+import asyncio
+import importlib.util
+import os
+import time
+import logging
+import logging.handlers
+import queue
+import sys
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import base64
-import time
-from typing import Dict, Any, Optional
+import secrets
+from typing import Dict, Any, Optional, Union
+
+# Fastest available JSON library: orjson, then ujson, then the stdlib
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
+
+# Advertise Brotli only when urllib3 can decode it (needs brotli or brotlicffi)
+if any(importlib.util.find_spec(name) for name in ("brotli", "brotlicffi")):
+    ACCEPT_ENCODING = "br, gzip"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
 
 # Configuration
 BACKEND_URL = "https://85d27d67-7cc2-46c2-84ad-796b974ba84d.preview.emergentagent.com/api"
+# Opt-in (REWEAR_REUSE_SESSION=1): persist the test user session between runs so
+# quick local reruns can skip re-authentication. Off by default so CI always runs
+# the full auth flow.
+REUSE_SESSION = os.environ.get("REWEAR_REUSE_SESSION") == "1"
+AUTH_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rewear_test_cache.json")
+AUTH_CACHE_MAX_AGE_SECONDS = 15 * 60
+# Result for auth tests that were not run because a cached session was reused;
+# lets dependent tests proceed but never counts as a pass
+CACHED = "cached"
+
+# Simple 1x1 pixel PNG uploaded by test_upload_image
+_PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d4944415478da6364f8cf500f00038601805a347d6b0000000049454e44ae426082"
+)
+
+def _dumps(obj: Any) -> bytes:
+    """Encode obj as JSON bytes (orjson returns bytes, ujson and json return str)"""
+    out = _json.dumps(obj)
+    return out if isinstance(out, (bytes, bytearray)) else out.encode("utf-8")
+
+def _parse(response: requests.Response) -> Any:
+    """Decode a JSON response body with the fastest available JSON library"""
+    return _json.loads(response.content)
+
+def _err_body(response: requests.Response, limit: int = 512) -> str:
+    """Return a bounded prefix of a response body for failure logs"""
+    return response.content[:limit].decode("utf-8", errors="replace")
 
 class ReWearAPITester:
+    # HTTP method -> unbound Session method, so any session can be passed to make_request
+    _METHODS = {
+        "GET": requests.Session.get,
+        "POST": requests.Session.post,
+        "PUT": requests.Session.put,
+        "PATCH": requests.Session.patch,
+        "DELETE": requests.Session.delete,
+    }
+    _BODY_METHODS = {"POST", "PUT", "PATCH"}
+    
     def __init__(self):
         self.base_url = BACKEND_URL
-        self.session = requests.Session()
+        # Every test hits the same host; keep a larger pool of keep-alive connections,
+        # shared by every session the tester creates
+        self._adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=3)
+        self.session = self._new_session()
+        # Session bound to the second user's token, created by test_create_second_user_and_swap
+        self.user2_session: Optional[requests.Session] = None
         self.auth_token = None
+        # Prebuilt request headers keyed by "send Authorization?"; rebuilt by _set_auth_token
+        self._headers_variants = {}
+        self._set_auth_token(None)
         self.admin_token = None
         self.test_user_id = None
         self.admin_user_id = None
+        self.test_image_id = None
         self.test_item_id = None
         self.test_swap_id = None
-        # Use timestamp to ensure unique emails
-        self.timestamp = str(int(time.time()))
+        # Points balance from the most recent /auth/me response
+        self._last_me_points = None
+        # Random suffix to ensure unique emails, even across back-to-back runs
+        self.uniq = secrets.token_hex(4)
+        self._email_sarah = f"sarah.johnson.{self.uniq}@example.com"
+        self._email_mike = f"mike.chen.{self.uniq}@example.com"
+        self._email_admin = f"admin.{self.uniq}@rewear.com"
+        
+        # Log records are queued here and formatted/printed on a background thread
+        log_queue = queue.Queue(-1)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"))
+        self._log_handler = logging.handlers.QueueHandler(log_queue)
+        self._log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        self._logger = logging.getLogger(__name__)
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(self._log_handler)
+        self._log_listener.start()
+        
+        # Request payloads are built once and reused as-is (never mutated)
+        self._user_payload = {
+            "email": self._email_sarah,
+            "name": "Sarah Johnson",
+            "password": "SecurePass123!"
+        }
+        self._login_payload = {
+            "email": self._user_payload["email"],
+            "password": self._user_payload["password"]
+        }
+        self._user2_payload = {
+            "email": self._email_mike,
+            "name": "Mike Chen",
+            "password": "SecurePass456!"
+        }
+        self._admin_payload = {
+            "email": self._email_admin,
+            "name": "Admin User",
+            "password": "AdminPass123!"
+        }
+        # images is filled in with the id returned by test_upload_image
+        self._item_payload = {
+            "title": "Vintage Denim Jacket",
+            "description": "Classic blue denim jacket in excellent condition. Perfect for layering in spring and fall.",
+            "category": "tops",
+            "type": "jacket",
+            "size": "M",
+            "condition": "like-new",
+            "tags": ["vintage", "denim", "casual", "blue"],
+            "points_value": 25
+        }
+        # item_id is only known once the test item exists
+        self._swap_payload = {
+            "swap_type": "points",
+            "message": "I'd love to have this jacket! It would go perfectly with my style."
+        }
         
     def log(self, message: str, level: str = "INFO"):
         """Log test messages with timestamp"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] [{level}] {message}")
+        self._logger.log(logging.getLevelName(level), message)
+        
+    def close(self):
+        """Flush queued log records and stop the log listener"""
+        self._log_listener.stop()
+        self._logger.removeHandler(self._log_handler)
+        
+    def _new_session(self) -> requests.Session:
+        """Create a session that reuses the tester's pooled connection adapter"""
+        session = requests.Session()
+        session.mount("https://", self._adapter)
+        session.headers.update({"Connection": "keep-alive", "Accept-Encoding": ACCEPT_ENCODING})
+        return session
+        
+    def _set_auth_token(self, token: Optional[str]):
+        """Set the test user's token and rebuild the prebuilt request headers"""
+        self.auth_token = token
+        json_headers = {"Content-Type": "application/json"}
+        self._headers_variants = {
+            False: json_headers,
+            True: {**json_headers, "Authorization": f"Bearer {token}"} if token else json_headers,
+        }
         
     def make_request(self, method: str, endpoint: str, data: Dict = None, 
-                    headers: Dict = None, auth_required: bool = False) -> requests.Response:
+                    headers: Dict = None, auth_required: bool = False,
+                    session: Optional[requests.Session] = None, files: Dict = None) -> requests.Response:
         """Make HTTP request with proper headers and authentication"""
         url = f"{self.base_url}{endpoint}"
+        session = session or self.session
         
-        request_headers = {"Content-Type": "application/json"}
+        # Shared prebuilt dict; only copied when extra headers are passed
+        request_headers = self._headers_variants[auth_required]
         if headers:
-            request_headers.update(headers)
-            
-        if auth_required and self.auth_token:
-            request_headers["Authorization"] = f"Bearer {self.auth_token}"
+            request_headers = {**request_headers, **headers}
             
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url, headers=request_headers)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data, headers=request_headers)
-            elif method.upper() == "PUT":
-                response = self.session.put(url, json=data, headers=request_headers)
-            elif method.upper() == "DELETE":
-                response = self.session.delete(url, headers=request_headers)
-            else:
+            send = self._METHODS.get(method.upper())
+            if send is None:
                 raise ValueError(f"Unsupported HTTP method: {method}")
                 
-            self.log(f"{method} {endpoint} -> {response.status_code}")
+            if files is not None:
+                # Multipart body; a None Content-Type also drops a session-level JSON one,
+                # so requests sets its own with the boundary
+                response = send(session, url, data=data, files=files, headers={**request_headers, "Content-Type": None})
+            elif method.upper() in self._BODY_METHODS and data is not None:
+                # Send pre-serialized bytes with an explicit length (never json=)
+                body = _dumps(data)
+                request_headers = {**request_headers, "Content-Length": str(len(body))}
+                response = send(session, url, data=body, headers=request_headers)
+            else:
+                response = send(session, url, headers=request_headers)
+                
+            self._logger.info("%s %s -> %d", method, endpoint, response.status_code)
             return response
             
         except Exception as e:
-            self.log(f"Request failed: {str(e)}", "ERROR")
+            self._logger.error("Request failed: %s", e)
             raise
             
-    def create_test_image(self) -> str:
-        """Create a simple base64 encoded test image"""
-        # Simple 1x1 pixel PNG in base64
-        return "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-
+    def _save_cached_auth(self):
+        """Persist the registered test user's token for the next run"""
+        cached = {
+            "auth_token": self.auth_token,
+            "user_id": self.test_user_id,
+            "email": self._email_sarah,
+            "saved_at": time.time()
+        }
+        try:
+            with open(AUTH_CACHE_FILE, "w") as f:
+                json.dump(cached, f)
+        except OSError as e:
+            self.log(f"Could not write auth cache: {e}", "WARNING")
+            
+    def _load_cached_auth(self) -> bool:
+        """Reuse a recent test user's token, validated with a single /auth/me call"""
+        try:
+            with open(AUTH_CACHE_FILE) as f:
+                cached = json.load(f)
+            saved_at = float(cached["saved_at"])
+            auth_token = cached["auth_token"]
+            user_id = cached["user_id"]
+            email = cached["email"]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Missing or malformed cache file; use the full auth flow
+            return False
+            
+        if time.time() - saved_at > AUTH_CACHE_MAX_AGE_SECONDS:
+            return False
+            
+        self._set_auth_token(auth_token)
+        response = self.make_request("GET", "/auth/me", auth_required=True)
+        
+        if response.status_code == 200:
+            data = _parse(response)
+            if data.get("id") == user_id:
+                self.test_user_id = user_id
+                self._email_sarah = email
+                self._last_me_points = data.get("points")
+                return True
+                
+        # Token rejected or belongs to someone else; fall back to the full auth flow
+        self.log("Cached test session is no longer valid, re-authenticating")
+        self._set_auth_token(None)
+        try:
+            os.remove(AUTH_CACHE_FILE)
+        except OSError:
+            pass
+        return False
+        
     def test_user_registration(self) -> bool:
         """Test user registration with 100 starting points"""
         self.log("Testing user registration...")
         
-        user_data = {
-            "email": f"sarah.johnson.{self.timestamp}@example.com",
-            "name": "Sarah Johnson",
-            "password": "SecurePass123!"
-        }
-        
-        response = self.make_request("POST", "/auth/register", user_data)
+        response = self.make_request("POST", "/auth/register", self._user_payload)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if "access_token" in data and "user" in data:
-                self.auth_token = data["access_token"]
+                self._set_auth_token(data["access_token"])
                 self.test_user_id = data["user"]["id"]
                 
                 # Verify user starts with 100 points
                 if data["user"]["points"] == 100:
                     self.log("✅ User registration successful with 100 starting points")
+                    if REUSE_SESSION:
+                        self._save_cached_auth()
                     return True
                 else:
                     self.log(f"❌ User should start with 100 points, got {data['user']['points']}", "ERROR")
@@ -96,31 +286,26 @@ class ReWearAPITester:
                 self.log("❌ Registration response missing required fields", "ERROR")
                 return False
         else:
-            self.log(f"❌ Registration failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Registration failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_user_login(self) -> bool:
         """Test user login and JWT token validation"""
         self.log("Testing user login...")
         
-        login_data = {
-            "email": f"sarah.johnson.{self.timestamp}@example.com",
-            "password": "SecurePass123!"
-        }
-        
-        response = self.make_request("POST", "/auth/login", login_data)
+        response = self.make_request("POST", "/auth/login", self._login_payload)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if "access_token" in data:
-                self.auth_token = data["access_token"]
+                self._set_auth_token(data["access_token"])
                 self.log("✅ User login successful")
                 return True
             else:
                 self.log("❌ Login response missing access token", "ERROR")
                 return False
         else:
-            self.log(f"❌ Login failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Login failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_jwt_validation(self) -> bool:
@@ -130,38 +315,60 @@ class ReWearAPITester:
         response = self.make_request("GET", "/auth/me", auth_required=True)
         
         if response.status_code == 200:
-            data = response.json()
-            if data.get("email") == f"sarah.johnson.{self.timestamp}@example.com":
+            data = _parse(response)
+            self._last_me_points = data.get("points")
+            if data.get("email") == self._email_sarah:
                 self.log("✅ JWT token validation successful")
                 return True
             else:
                 self.log("❌ JWT validation returned wrong user data", "ERROR")
                 return False
         else:
-            self.log(f"❌ JWT validation failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ JWT validation failed: {response.status_code} - {_err_body(response)}", "ERROR")
+            return False
+
+    def test_upload_image(self) -> bool:
+        """Test uploading an item image to /api/uploads"""
+        self.log("Testing image upload...")
+        
+        response = self.make_request(
+            "POST", "/uploads", files={"file": ("test.png", _PNG_BYTES, "image/png")}, auth_required=True
+        )
+        
+        if response.status_code == 200:
+            data = _parse(response)
+            if "image_id" not in data:
+                self.log("❌ Upload response missing image_id", "ERROR")
+                return False
+            self.test_image_id = data["image_id"]
+            
+            # Round trip: the stored bytes come back unchanged and cacheable
+            image_response = self.make_request("GET", f"/uploads/{self.test_image_id}")
+            if image_response.status_code != 200:
+                self.log(f"❌ Uploaded image fetch failed: {image_response.status_code} - {_err_body(image_response)}", "ERROR")
+                return False
+            content_type = image_response.headers.get("Content-Type", "")
+            cache_control = image_response.headers.get("Cache-Control", "")
+            if image_response.content == _PNG_BYTES and content_type == "image/png" and "immutable" in cache_control:
+                self.log("✅ Image upload successful")
+                return True
+            else:
+                self.log(f"❌ Uploaded image round trip mismatch ({len(image_response.content)} bytes, {content_type!r}, {cache_control!r})", "ERROR")
+                return False
+        else:
+            self.log(f"❌ Image upload failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_create_item(self) -> bool:
-        """Test creating an item with base64 image"""
+        """Test creating an item that references an uploaded image"""
         self.log("Testing item creation...")
         
-        item_data = {
-            "title": "Vintage Denim Jacket",
-            "description": "Classic blue denim jacket in excellent condition. Perfect for layering in spring and fall.",
-            "category": "tops",
-            "type": "jacket",
-            "size": "M",
-            "condition": "like-new",
-            "tags": ["vintage", "denim", "casual", "blue"],
-            "images": [self.create_test_image()],
-            "points_value": 25
-        }
-        
+        item_data = {**self._item_payload, "images": [self.test_image_id]}
         response = self.make_request("POST", "/items", item_data, auth_required=True)
         
         if response.status_code == 200:
-            data = response.json()
-            if "id" in data and data.get("title") == item_data["title"]:
+            data = _parse(response)
+            if "id" in data and data.get("title") == self._item_payload["title"]:
                 self.test_item_id = data["id"]
                 self.log("✅ Item creation successful")
                 return True
@@ -169,7 +376,7 @@ class ReWearAPITester:
                 self.log("❌ Item creation response missing required fields", "ERROR")
                 return False
         else:
-            self.log(f"❌ Item creation failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Item creation failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_browse_items(self) -> bool:
@@ -179,7 +386,7 @@ class ReWearAPITester:
         response = self.make_request("GET", "/items")
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if isinstance(data, list):
                 self.log(f"✅ Item browsing successful - found {len(data)} items")
                 return True
@@ -187,7 +394,7 @@ class ReWearAPITester:
                 self.log("❌ Items response should be a list", "ERROR")
                 return False
         else:
-            self.log(f"❌ Item browsing failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Item browsing failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_category_filtering(self) -> bool:
@@ -197,21 +404,21 @@ class ReWearAPITester:
         response = self.make_request("GET", "/items?category=tops")
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if isinstance(data, list):
-                # Check if all items are in tops category
-                all_tops = all(item.get("category") == "tops" for item in data)
-                if all_tops:
+                # Check if all items are in tops category (a missing field fails as a schema error)
+                categories = {item["category"] for item in data}
+                if categories <= {"tops"}:
                     self.log("✅ Category filtering successful")
                     return True
                 else:
-                    self.log("❌ Category filtering returned items from wrong category", "ERROR")
+                    self.log(f"❌ Category filtering returned items from wrong categories: {sorted(categories - {'tops'})}", "ERROR")
                     return False
             else:
                 self.log("❌ Category filter response should be a list", "ERROR")
                 return False
         else:
-            self.log(f"❌ Category filtering failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Category filtering failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_featured_items(self) -> bool:
@@ -221,7 +428,7 @@ class ReWearAPITester:
         response = self.make_request("GET", "/items/featured")
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if isinstance(data, list) and len(data) <= 6:
                 self.log(f"✅ Featured items successful - {len(data)} items")
                 return True
@@ -229,7 +436,7 @@ class ReWearAPITester:
                 self.log("❌ Featured items should return max 6 items", "ERROR")
                 return False
         else:
-            self.log(f"❌ Featured items failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Featured items failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_create_second_user_and_swap(self) -> bool:
@@ -237,21 +444,19 @@ class ReWearAPITester:
         self.log("Creating second user for swap testing...")
         
         # Create second user
-        user2_data = {
-            "email": f"mike.chen.{self.timestamp}@example.com",
-            "name": "Mike Chen",
-            "password": "SecurePass456!"
-        }
-        
-        response = self.make_request("POST", "/auth/register", user2_data)
+        response = self.make_request("POST", "/auth/register", self._user2_payload)
         
         if response.status_code != 200:
-            self.log(f"❌ Second user creation failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Second user creation failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
             
-        # Store second user's token
-        user2_token = response.json()["access_token"]
-        user2_id = response.json()["user"]["id"]
+        # Bind the second user's token to its own session
+        user2_token = _parse(response)["access_token"]
+        self.user2_session = self._new_session()
+        self.user2_session.headers.update({
+            "Authorization": f"Bearer {user2_token}",
+            "Content-Type": "application/json"
+        })
         
         # Now test swap request from second user to first user's item
         self.log("Testing swap request creation between different users...")
@@ -260,18 +465,13 @@ class ReWearAPITester:
             self.log("❌ No test item available for swap request", "ERROR")
             return False
             
-        swap_data = {
-            "item_id": self.test_item_id,
-            "swap_type": "points",
-            "message": "I'd love to have this jacket! It would go perfectly with my style."
-        }
+        swap_data = {**self._swap_payload, "item_id": self.test_item_id}
         
-        # Use second user's token for the swap request
-        headers = {"Authorization": f"Bearer {user2_token}"}
-        response = self.make_request("POST", "/swaps", swap_data, headers=headers)
+        # Use second user's session for the swap request
+        response = self.make_request("POST", "/swaps", swap_data, session=self.user2_session)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if "id" in data and data.get("swap_type") == "points":
                 self.test_swap_id = data["id"]
                 self.log("✅ Swap request creation successful between different users")
@@ -280,7 +480,7 @@ class ReWearAPITester:
                 self.log("❌ Swap request response missing required fields", "ERROR")
                 return False
         else:
-            self.log(f"❌ Swap request creation failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Swap request creation failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_incoming_swaps(self) -> bool:
@@ -290,7 +490,7 @@ class ReWearAPITester:
         response = self.make_request("GET", "/swaps/incoming", auth_required=True)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if isinstance(data, list):
                 self.log(f"✅ Incoming swaps successful - {len(data)} requests")
                 return True
@@ -298,7 +498,7 @@ class ReWearAPITester:
                 self.log("❌ Incoming swaps response should be a list", "ERROR")
                 return False
         else:
-            self.log(f"❌ Incoming swaps failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Incoming swaps failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_outgoing_swaps(self) -> bool:
@@ -308,7 +508,7 @@ class ReWearAPITester:
         response = self.make_request("GET", "/swaps/outgoing", auth_required=True)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if isinstance(data, list):
                 self.log(f"✅ Outgoing swaps successful - {len(data)} requests")
                 return True
@@ -316,7 +516,7 @@ class ReWearAPITester:
                 self.log("❌ Outgoing swaps response should be a list", "ERROR")
                 return False
         else:
-            self.log(f"❌ Outgoing swaps failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Outgoing swaps failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_accept_swap_and_points_transfer(self) -> bool:
@@ -327,51 +527,128 @@ class ReWearAPITester:
             self.log("❌ No test swap available for acceptance", "ERROR")
             return False
             
-        # Get current points before swap
-        me_response = self.make_request("GET", "/auth/me", auth_required=True)
-        if me_response.status_code != 200:
-            self.log("❌ Could not get current user points", "ERROR")
-            return False
-            
-        initial_points = me_response.json().get("points", 0)
+        # Get current points before swap, reusing the balance from JWT validation when available
+        initial_points = self._last_me_points
+        if initial_points is None:
+            me_response = self.make_request("GET", "/auth/me", auth_required=True)
+            if me_response.status_code != 200:
+                self.log("❌ Could not get current user points", "ERROR")
+                return False
+                
+            initial_points = _parse(me_response).get("points", 0)
         
         # Accept the swap
         response = self.make_request("PUT", f"/swaps/{self.test_swap_id}/accept", auth_required=True)
         
         if response.status_code == 200:
-            # Check if points were transferred
-            me_response_after = self.make_request("GET", "/auth/me", auth_required=True)
-            if me_response_after.status_code == 200:
-                final_points = me_response_after.json().get("points", 0)
-                expected_points = initial_points + 25  # Item was worth 25 points
-                
-                if final_points == expected_points:
-                    self.log(f"✅ Swap acceptance and points transfer successful ({initial_points} -> {final_points})")
-                    return True
-                else:
-                    self.log(f"❌ Points transfer incorrect. Expected {expected_points}, got {final_points}", "ERROR")
+            # Check if points were transferred, from the accept response if it reports them
+            data = _parse(response)
+            if "points" in data:
+                final_points = data["points"]
+            else:
+                me_response_after = self.make_request("GET", "/auth/me", auth_required=True)
+                if me_response_after.status_code != 200:
+                    self.log("❌ Could not verify points after swap", "ERROR")
                     return False
+                final_points = _parse(me_response_after).get("points", 0)
+            self._last_me_points = final_points
+            expected_points = initial_points + 25  # Item was worth 25 points
+            
+            if final_points == expected_points:
+                self.log(f"✅ Swap acceptance and points transfer successful ({initial_points} -> {final_points})")
+                return True
             else:
-                self.log("❌ Could not verify points after swap", "ERROR")
+                self.log(f"❌ Points transfer incorrect. Expected {expected_points}, got {final_points}", "ERROR")
+                return False
+        else:
+            self.log(f"❌ Swap acceptance failed: {response.status_code} - {_err_body(response)}", "ERROR")
+            return False
+
+    def test_accept_swap_twice(self) -> bool:
+        """Test that accepting an already accepted swap is rejected and moves no points"""
+        self.log("Testing repeated swap acceptance...")
+        
+        response = self.make_request("PUT", f"/swaps/{self.test_swap_id}/accept", auth_required=True)
+        if response.status_code != 409:
+            self.log(f"❌ Second acceptance should be rejected with 409, got {response.status_code} - {_err_body(response)}", "ERROR")
+            return False
+        
+        owner_response = self.make_request("GET", "/auth/me", auth_required=True)
+        requester_response = self.make_request("GET", "/auth/me", session=self.user2_session)
+        if owner_response.status_code != 200 or requester_response.status_code != 200:
+            self.log("❌ Could not verify points after repeated acceptance", "ERROR")
+            return False
+        
+        owner_points = _parse(owner_response).get("points")
+        requester_points = _parse(requester_response).get("points")
+        # The requester started with 100 points and paid 25 for the item exactly once
+        if owner_points == self._last_me_points and requester_points == 75:
+            self.log("✅ Repeated swap acceptance rejected, points moved once")
+            return True
+        else:
+            self.log(f"❌ Points moved again: owner {self._last_me_points} -> {owner_points}, requester has {requester_points} (expected 75)", "ERROR")
+            return False
+
+    def test_accept_swap_insufficient_points(self) -> bool:
+        """Test that accepting a swap the requester can no longer afford fails with 400"""
+        self.log("Testing swap acceptance with insufficient points...")
+        
+        me_response = self.make_request("GET", "/auth/me", session=self.user2_session)
+        if me_response.status_code != 200:
+            self.log("❌ Could not get requester points", "ERROR")
+            return False
+        requester_points = _parse(me_response).get("points", 0)
+        
+        # Two items the requester can afford one at a time but not together
+        price = requester_points // 2 + 1
+        item_data = {**self._item_payload, "images": [self.test_image_id], "points_value": price}
+        swap_ids = []
+        for _ in range(2):
+            response = self.make_request("POST", "/items", item_data, auth_required=True)
+            if response.status_code != 200:
+                self.log(f"❌ Item creation failed: {response.status_code} - {_err_body(response)}", "ERROR")
+                return False
+            swap_data = {**self._swap_payload, "item_id": _parse(response)["id"]}
+            response = self.make_request("POST", "/swaps", swap_data, session=self.user2_session)
+            if response.status_code != 200:
+                self.log(f"❌ Swap request creation failed: {response.status_code} - {_err_body(response)}", "ERROR")
                 return False
+            swap_ids.append(_parse(response)["id"])
+        
+        response = self.make_request("PUT", f"/swaps/{swap_ids[0]}/accept", auth_required=True)
+        if response.status_code != 200:
+            self.log(f"❌ Swap acceptance failed: {response.status_code} - {_err_body(response)}", "ERROR")
+            return False
+        
+        response = self.make_request("PUT", f"/swaps/{swap_ids[1]}/accept", auth_required=True)
+        if response.status_code != 400:
+            self.log(f"❌ Unaffordable swap should be rejected with 400, got {response.status_code} - {_err_body(response)}", "ERROR")
+            return False
+        
+        me_response = self.make_request("GET", "/auth/me", session=self.user2_session)
+        outgoing_response = self.make_request("GET", "/swaps/outgoing", session=self.user2_session)
+        if me_response.status_code != 200 or outgoing_response.status_code != 200:
+            self.log("❌ Could not verify state after rejected acceptance", "ERROR")
+            return False
+        
+        final_points = _parse(me_response).get("points")
+        statuses = {swap["id"]: swap["status"] for swap in _parse(outgoing_response)}
+        # Only the first swap was paid for; the second is left pending
+        if final_points == requester_points - price and statuses.get(swap_ids[1]) == "pending":
+            self.log("✅ Unaffordable swap rejected with 400, swap left pending")
+            return True
         else:
-            self.log(f"❌ Swap acceptance failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Unexpected state: requester has {final_points} (expected {requester_points - price}), swap status {statuses.get(swap_ids[1])}", "ERROR")
             return False
 
     def test_create_admin_user(self) -> bool:
         """Create an admin user for testing admin endpoints"""
         self.log("Creating admin user for testing...")
         
-        admin_data = {
-            "email": f"admin.{self.timestamp}@rewear.com",
-            "name": "Admin User",
-            "password": "AdminPass123!"
-        }
-        
-        response = self.make_request("POST", "/auth/register", admin_data)
+        response = self.make_request("POST", "/auth/register", self._admin_payload)
         
         if response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             self.admin_token = data["access_token"]
             self.admin_user_id = data["user"]["id"]
             
@@ -380,7 +657,7 @@ class ReWearAPITester:
             self.log("✅ Admin user created (Note: Admin status needs to be set manually in DB)")
             return True
         else:
-            self.log(f"❌ Admin user creation failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Admin user creation failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
     def test_admin_get_items(self) -> bool:
@@ -396,7 +673,7 @@ class ReWearAPITester:
             self.log("⚠️ Admin access denied (expected - admin status not set in DB)")
             return True  # This is expected behavior
         elif response.status_code == 200:
-            data = response.json()
+            data = _parse(response)
             if isinstance(data, list):
                 self.log("✅ Admin get items successful")
                 return True
@@ -404,58 +681,83 @@ class ReWearAPITester:
                 self.log("❌ Admin items response should be a list", "ERROR")
                 return False
         else:
-            self.log(f"❌ Admin get items failed: {response.status_code} - {response.text}", "ERROR")
+            self.log(f"❌ Admin get items failed: {response.status_code} - {_err_body(response)}", "ERROR")
             return False
 
-    def run_comprehensive_test(self) -> Dict[str, bool]:
-        """Run all tests and return results"""
+    async def run_comprehensive_test(self) -> Dict[str, Union[bool, str, None]]:
+        """Run all tests as a dependency graph and return results (None = skipped, CACHED = not run)"""
         self.log("=" * 60)
         self.log("STARTING COMPREHENSIVE REWEAR BACKEND API TESTING")
         self.log("=" * 60)
         
-        test_results = {}
-        
-        # Authentication System Tests
-        self.log("\n🔐 TESTING USER AUTHENTICATION SYSTEM")
-        test_results["user_registration"] = self.test_user_registration()
-        test_results["user_login"] = self.test_user_login()
-        test_results["jwt_validation"] = self.test_jwt_validation()
-        
-        # Item Management Tests
-        self.log("\n📦 TESTING ITEM MANAGEMENT API")
-        test_results["create_item"] = self.test_create_item()
-        test_results["browse_items"] = self.test_browse_items()
-        test_results["category_filtering"] = self.test_category_filtering()
-        test_results["featured_items"] = self.test_featured_items()
-        
-        # Swap System Tests
-        self.log("\n🔄 TESTING SWAP REQUEST SYSTEM")
-        test_results["create_second_user_and_swap"] = self.test_create_second_user_and_swap()
-        test_results["incoming_swaps"] = self.test_incoming_swaps()
-        test_results["outgoing_swaps"] = self.test_outgoing_swaps()
-        
-        # Points System Tests
-        self.log("\n💰 TESTING POINT-BASED EXCHANGE SYSTEM")
-        test_results["accept_swap_points_transfer"] = self.test_accept_swap_and_points_transfer()
+        # (name, test, depends_on); cheap independent roots come first so a broken
+        # deployment shows up immediately
+        plan = [
+            ("browse_items", self.test_browse_items, []),
+            ("featured_items", self.test_featured_items, []),
+            # Authentication System Tests
+            ("user_registration", self.test_user_registration, []),
+            ("user_login", self.test_user_login, ["user_registration"]),
+            ("jwt_validation", self.test_jwt_validation, ["user_login"]),
+            # Item Management Tests
+            ("upload_image", self.test_upload_image, ["jwt_validation"]),
+            ("create_item", self.test_create_item, ["upload_image"]),
+            # Needs the created "tops" item so the filter is checked against real data
+            ("category_filtering", self.test_category_filtering, ["create_item"]),
+            # Swap System Tests
+            ("create_second_user_and_swap", self.test_create_second_user_and_swap, ["create_item"]),
+            ("incoming_swaps", self.test_incoming_swaps, ["create_second_user_and_swap"]),
+            ("outgoing_swaps", self.test_outgoing_swaps, ["jwt_validation"]),
+            # Points System Tests
+            ("accept_swap_points_transfer", self.test_accept_swap_and_points_transfer, ["create_second_user_and_swap"]),
+            # Both check the requester's balance, so they run after the first transfer and not alongside each other
+            ("accept_swap_twice", self.test_accept_swap_twice, ["accept_swap_points_transfer"]),
+            ("accept_swap_insufficient_points", self.test_accept_swap_insufficient_points, ["accept_swap_twice"]),
+            # Admin System Tests
+            ("create_admin_user", self.test_create_admin_user, []),
+            ("admin_get_items", self.test_admin_get_items, ["create_admin_user"]),
+        ]
+        
+        precomputed = {}
+        if REUSE_SESSION and await asyncio.to_thread(self._load_cached_auth):
+            # Registration, login and JWT validation are not exercised on this run
+            self.log("♻️ Reusing cached test user session (register/login/JWT validation not run)", "WARNING")
+            precomputed = {"user_registration": CACHED, "user_login": CACHED, "jwt_validation": CACHED}
+        
+        tasks = {}
+        
+        async def run_test(name, test, depends_on):
+            if name in precomputed:
+                return precomputed[name]
+            dep_results = await asyncio.gather(*(tasks[dep] for dep in depends_on))
+            failed = [dep for dep, ok in zip(depends_on, dep_results) if not ok]
+            if failed:
+                self.log(f"⏭️ Skipping {name}: prerequisite failed ({', '.join(failed)})", "WARNING")
+                return None
+            # Tests are blocking requests calls; run them in worker threads so
+            # independent ones keep several HTTP requests in flight at once
+            try:
+                return await asyncio.to_thread(test)
+            except Exception as e:
+                # A crashing test fails on its own instead of aborting the whole run
+                self.log(f"❌ {name} raised {type(e).__name__}: {e}", "ERROR")
+                return False
         
-        # Admin System Tests
-        self.log("\n👑 TESTING ADMIN MODERATION SYSTEM")
-        test_results["create_admin_user"] = self.test_create_admin_user()
-        test_results["admin_get_items"] = self.test_admin_get_items()
+        for name, test, depends_on in plan:
+            tasks[name] = asyncio.create_task(run_test(name, test, depends_on))
+        test_results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
         
         # Summary
         self.log("\n" + "=" * 60)
         self.log("TEST RESULTS SUMMARY")
         self.log("=" * 60)
         
-        passed = 0
+        passed = sum(1 for result in test_results.values() if result is True)
         total = len(test_results)
         
-        for test_name, result in test_results.items():
-            status = "✅ PASS" if result else "❌ FAIL"
-            self.log(f"{test_name}: {status}")
-            if result:
-                passed += 1
+        labels = {True: "✅ PASS", False: "❌ FAIL", None: "⏭️ SKIPPED", CACHED: "♻️ NOT RUN (cached session)"}
+        lines = [f"{test_name}: {labels[result]}" for test_name, result in test_results.items()]
+        self.log("\n".join(lines))
                 
         self.log(f"\nOVERALL: {passed}/{total} tests passed ({(passed/total)*100:.1f}%)")
         
@@ -463,16 +765,24 @@ class ReWearAPITester:
 
 if __name__ == "__main__":
     tester = ReWearAPITester()
-    results = tester.run_comprehensive_test()
+    try:
+        results = asyncio.run(tester.run_comprehensive_test())
+    finally:
+        tester.close()
     
     # Exit with error code if any critical tests failed
     critical_tests = [
         "user_registration", "user_login", "jwt_validation",
-        "create_item", "browse_items", "create_second_user_and_swap",
-        "accept_swap_points_transfer"
+        "upload_image", "create_item", "browse_items", "create_second_user_and_swap",
+        "accept_swap_points_transfer", "accept_swap_twice", "accept_swap_insufficient_points"
     ]
     
-    critical_failures = [test for test in critical_tests if not results.get(test, False)]
+    # Auth tests skipped by an opted-in session reuse are reported, not failed
+    not_run = [test for test in critical_tests if results.get(test) == CACHED]
+    critical_failures = [test for test in critical_tests if results.get(test) is not True and test not in not_run]
+    
+    if not_run:
+        print(f"\n♻️ NOT RUN (REWEAR_REUSE_SESSION=1 reused a cached session): {not_run}")
     
     if critical_failures:
         print(f"\n❌ CRITICAL TEST FAILURES: {critical_failures}")